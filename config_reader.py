@@ -3,12 +3,56 @@
 Configuration reader for LLM API keys and model settings.
 """
 
-import json
+import functools
 import os
-from typing import Dict, Any, Optional
+import sys
+import orjson
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class ModelSpec:
+    """Resolved connection settings for a single model provider."""
+    model_name: str
+    api_url: str
+    api_key: str
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(config_file: str, mtime_ns: int) -> Tuple[Mapping[str, Any], Mapping[str, ModelSpec]]:
+    """
+    Parse a config file, cached per (path, mtime) so edits are still picked up.
+    
+    The result is shared between ConfigReader instances, so it is returned as
+    read-only mappings; model names are interned for cheap lookups.
+    """
+    with open(config_file, 'rb') as f:
+        config = orjson.loads(f.read())
+    
+    model_configs = {
+        sys.intern(name): MappingProxyType(model_config)
+        for name, model_config in config["models"].items()
+    }
+    config["models"] = MappingProxyType(model_configs)
+    
+    # Incomplete entries get no spec, so only that model fails (in get_model_spec)
+    models = {
+        name: ModelSpec(
+            model_name=model_config["model_name"],
+            api_url=model_config["api_url"],
+            api_key=model_config.get("api_key", "")
+        )
+        for name, model_config in model_configs.items()
+        if "model_name" in model_config and "api_url" in model_config
+    }
+    return MappingProxyType(config), MappingProxyType(models)
 
 
 class ConfigReader:
+    __slots__ = ('config_file', 'config', 'models')
+    
     def __init__(self, config_file: str = "config.json"):
         """
         Initialize config reader.
@@ -17,15 +61,16 @@ class ConfigReader:
             config_file: Path to the JSON configuration file
         """
         self.config_file = config_file
-        self.config = self._load_config()
+        self.config, self.models = self._load_config()
     
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from JSON file."""
-        if not os.path.exists(self.config_file):
-            raise FileNotFoundError(f"Config file '{self.config_file}' not found")
+    def _load_config(self) -> Tuple[Mapping[str, Any], Mapping[str, ModelSpec]]:
+        """Load configuration from JSON file, along with the per-model specs."""
+        try:
+            mtime_ns = os.stat(self.config_file).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config file '{self.config_file}' not found") from None
         
-        with open(self.config_file, 'r') as f:
-            return json.load(f)
+        return _load_config_cached(self.config_file, mtime_ns)
     
     def get_api_key(self, model: str) -> str:
         """
@@ -37,16 +82,17 @@ class ConfigReader:
         Returns:
             API key string
         """
-        if model not in self.config["models"]:
+        model_config = self.config["models"].get(model)
+        if model_config is None:
             raise ValueError(f"Model '{model}' not found in config")
         
-        api_key = self.config["models"][model]["api_key"]
+        api_key = model_config.get("api_key")
         if not api_key:
             raise ValueError(f"API key for '{model}' is empty in config")
         
         return api_key
     
-    def get_model_config(self, model: str) -> Dict[str, Any]:
+    def get_model_config(self, model: str) -> Mapping[str, Any]:
         """
         Get complete configuration for specified model.
         
@@ -54,12 +100,31 @@ class ConfigReader:
             model: Model name (openai, claude, gemini)
             
         Returns:
-            Dictionary with model configuration
+            Read-only mapping with model configuration
+        """
+        model_config = self.config["models"].get(model)
+        if model_config is None:
+            raise ValueError(f"Model '{model}' not found in config")
+        
+        return model_config
+    
+    def get_model_spec(self, model: str) -> ModelSpec:
+        """
+        Get resolved connection settings for specified model.
+        
+        Args:
+            model: Model name (openai, claude, gemini)
+            
+        Returns:
+            ModelSpec with model name, API URL and API key
         """
-        if model not in self.config["models"]:
+        spec = self.models.get(model)
+        if spec is None:
+            if model in self.config["models"]:
+                raise ValueError(f"Model '{model}' is missing 'model_name' or 'api_url' in config")
             raise ValueError(f"Model '{model}' not found in config")
         
-        return self.config["models"][model]
+        return spec
     
     def get_default_model(self) -> str:
         """Get the default model name."""
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Disk cache for LLM responses.
+
+Responses are stored one file per prompt, keyed by a hash of the model and
+prompt, so rerunning the same request against an unchanged repository skips
+the API call entirely.
+"""
+
+import hashlib
+import os
+import time
+from typing import Optional
+
+import orjson
+
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "minimal-llm-code-gen"
+)
+DEFAULT_TTL = 7 * 24 * 60 * 60  # 7 days
+
+
+class LLMCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: int = DEFAULT_TTL):
+        """
+        Initialize LLM response cache.
+        
+        Args:
+            cache_dir: Directory to store cached responses in
+            ttl: Maximum age of a cached response in seconds
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+    
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Build the cache key for a model/prompt pair."""
+        return hashlib.sha256((model + prompt).encode()).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from make_key()
+        
+        Returns:
+            Cached response, or None if missing, expired or unreadable
+        """
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())["response"]
+        except (OSError, KeyError, orjson.JSONDecodeError):
+            return None
+    
+    def set(self, key: str, response: str) -> None:
+        """
+        Store a response in the cache.
+        
+        Args:
+            key: Cache key from make_key()
+            response: LLM response text
+        """
+        path = self._path(key)
+        
+        # Write to a sibling temp file and rename so readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps({"response": response}))
+            os.replace(tmp_path, path)
+        except OSError:
+            # Caching is best-effort; an unwritable cache must not lose the response
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
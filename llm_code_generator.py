@@ -8,35 +8,161 @@ and executes the generated code safely.
 
 import sys
 import subprocess
-import tempfile
 import os
-import json
+import re
+import shutil
 import argparse
-from typing import Optional, Dict, Any
-import requests
+import atexit
+import threading
+from typing import Optional, Dict, Any, List, Iterator
+import orjson
 from config_reader import load_config
 
 
+_PROMPT_TEMPLATE = """
+You are a Python code generator. Given a problem statement, generate clean, executable Python code.
+
+Problem: {problem}
+
+Requirements:
+1. Generate only Python code that solves the problem
+2. Include necessary imports
+3. Add a main function or execution block
+4. Make the code self-contained and executable
+5. Do not include explanations or markdown formatting
+6. Ensure the code is safe and doesn't perform harmful operations
+
+Generate the Python code:
+"""
+
+# Markdown code fence around a model response; either fence may be missing
+# (truncated responses, or a model that only emits the closing one).
+_FENCE_RE = re.compile(r'^\s*(?:```(?:python)?\n?)?(.*?)\n?(?:```)?\s*$', re.DOTALL)
+
+# Shared session so repeated API calls reuse pooled keep-alive connections
+# instead of paying a new TCP+TLS handshake each time. Built lazily so that
+# importing this module does not pull in requests/urllib3/ssl.
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session():
+    """Return the shared HTTP session, creating it on first use."""
+    global _SESSION
+    if _SESSION is not None:
+        return _SESSION
+    
+    # Several threads (solve_many, implement_and_suggest) may get here at once
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            return _SESSION
+        
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset({"POST"})
+            )
+        ))
+        _SESSION = session
+    return _SESSION
+
+
+class _WorkerPool:
+    """
+    Pre-started interpreters waiting to receive generated code on stdin.
+    
+    Each worker runs exactly one snippet and exits, so isolation is the same as
+    a fresh subprocess.run; the gain is that interpreter start-up happens in the
+    background (e.g. while the LLM call is in flight) instead of on the
+    execution path.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spares: Dict[str, List[subprocess.Popen]] = {}
+    
+    @staticmethod
+    def _spawn(runtime: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            [runtime, '-I', '-'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+    
+    def prewarm(self, runtime: str) -> None:
+        """Start a spare worker for runtime in the background."""
+        worker = self._spawn(runtime)
+        with self._lock:
+            self._spares.setdefault(runtime, []).append(worker)
+    
+    def acquire(self, runtime: str) -> subprocess.Popen:
+        """Take a spare worker for runtime, starting one if none is ready."""
+        with self._lock:
+            spares = self._spares.get(runtime, [])
+            while spares:
+                worker = spares.pop()
+                if worker.poll() is None:
+                    return worker
+        return self._spawn(runtime)
+    
+    def discard(self, runtime: str) -> None:
+        """Stop one spare worker for runtime, e.g. when the prewarmed one won't be used."""
+        with self._lock:
+            spares = self._spares.get(runtime, [])
+            worker = spares.pop() if spares else None
+        if worker is not None:
+            worker.kill()
+            worker.communicate()
+    
+    def close(self) -> None:
+        """Stop all spare workers."""
+        with self._lock:
+            workers = [w for spares in self._spares.values() for w in spares]
+            self._spares.clear()
+        for worker in workers:
+            worker.kill()
+            worker.communicate()
+
+
+_WORKERS = _WorkerPool()
+atexit.register(_WORKERS.close)
+
+
 class LLMCodeGenerator:
-    def __init__(self, api_key: Optional[str] = None, model: str = "openai"):
+    __slots__ = ('api_key', 'model', 'api_url', '_headers', '_base_payload', 'runtime')
+    
+    def __init__(self, api_key: Optional[str] = None, model: str = "openai",
+                 runtime: Optional[str] = None):
         """
         Initialize the LLM Code Generator
         
         Args:
             api_key: API key (optional, will load from config if not provided)
             model: Model provider to use (openai, claude, gemini)
+            runtime: Python interpreter used to execute generated code
+                (defaults to the current interpreter)
         """
+        self.runtime = runtime or sys.executable
+        
         try:
             config = load_config()
             if api_key:
+                spec = config.get_model_spec("openai")
                 self.api_key = api_key
-                self.model = config.get_model_config("openai")["model_name"]
-                self.api_url = config.get_model_config("openai")["api_url"]
             else:
-                model_config = config.get_model_config(model)
-                self.api_key = model_config["api_key"]
-                self.model = model_config["model_name"]
-                self.api_url = model_config["api_url"]
+                spec = config.get_model_spec(model)
+                self.api_key = spec.api_key
+            self.model, self.api_url = spec.model_name, spec.api_url
         except Exception as e:
             self.api_key = api_key or os.getenv("OPENAI_API_KEY")
             self.model = "gpt-3.5-turbo"
@@ -44,68 +170,156 @@ class LLMCodeGenerator:
         
         if not self.api_key:
             raise ValueError("API key is required. Add it to config.json or set environment variable.")
+        
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self._base_payload = {
+            "model": self.model,
+            "max_completion_tokens": 2000
+        }
     
-    def generate_code(self, problem_statement: str) -> str:
+    def generate_code(self, problem_statement: str, stream: bool = False) -> str:
         """
         Generate Python code for the given problem statement using LLM
         
         Args:
             problem_statement: Description of the problem to solve
+            stream: Stream the completion and stop reading as soon as the
+                first fenced code block is closed
             
         Returns:
             Generated Python code as string
         """
-        prompt = f"""
-You are a Python code generator. Given a problem statement, generate clean, executable Python code.
-
-Problem: {problem_statement}
-
-Requirements:
-1. Generate only Python code that solves the problem
-2. Include necessary imports
-3. Add a main function or execution block
-4. Make the code self-contained and executable
-5. Do not include explanations or markdown formatting
-6. Ensure the code is safe and doesn't perform harmful operations
-
-Generate the Python code:
-"""
+        import requests
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        prompt = _PROMPT_TEMPLATE.format_map({'problem': problem_statement})
         
-        data = {
-            "model": self.model,
+        request = {
+            **self._base_payload,
             "messages": [
                 {"role": "user", "content": prompt}
-            ],
-            "max_completion_tokens": 2000
+            ]
         }
+        if stream:
+            request["stream"] = True
+        payload = orjson.dumps(request)
         
         try:
-            response = requests.post(self.api_url, headers=headers, json=data, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            generated_code = result["choices"][0]["message"]["content"].strip()
+            with _get_session().post(self.api_url, headers=self._headers, data=payload,
+                                     timeout=30, stream=stream) as response:
+                if response.status_code >= 400:
+                    raise Exception(f"Error calling LLM API: HTTP {response.status_code}: {response.text[:200]}")
+                
+                # Endpoints that ignore "stream" answer with a plain JSON body
+                if stream and self._is_event_stream(response):
+                    generated_code = self._read_stream(response)
+                else:
+                    result = orjson.loads(response.content)
+                    generated_code = result["choices"][0]["message"]["content"]
             
             # Clean up the code (remove markdown formatting if present)
-            if generated_code.startswith("```python"):
-                generated_code = generated_code[9:]
-            if generated_code.startswith("```"):
-                generated_code = generated_code[3:]
-            if generated_code.endswith("```"):
-                generated_code = generated_code[:-3]
+            match = _FENCE_RE.match(generated_code)
+            return (match.group(1) if match else generated_code).strip()
             
-            return generated_code.strip()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Error calling LLM API: {e}")
+        except (KeyError, IndexError, orjson.JSONDecodeError) as e:
+            raise Exception(f"Unexpected API response format: {e}")
+    
+    def generate_code_stream(self, problem_statement: str) -> Iterator[str]:
+        """
+        Stream the LLM response for the given problem statement
+        
+        Unlike generate_code, the raw text is yielded as it arrives, without
+        removing markdown formatting.
+        
+        Args:
+            problem_statement: Description of the problem to solve
+            
+        Returns:
+            Iterator over chunks of the response text
+        """
+        import requests
+        
+        prompt = _PROMPT_TEMPLATE.format_map({'problem': problem_statement})
+        
+        payload = orjson.dumps({
+            **self._base_payload,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "stream": True
+        })
+        
+        try:
+            with _get_session().post(self.api_url, headers=self._headers, data=payload,
+                                     timeout=30, stream=True) as response:
+                if response.status_code >= 400:
+                    raise Exception(f"Error calling LLM API: HTTP {response.status_code}: {response.text[:200]}")
+                
+                if self._is_event_stream(response):
+                    yield from self._iter_deltas(response)
+                else:
+                    yield orjson.loads(response.content)["choices"][0]["message"]["content"]
             
         except requests.exceptions.RequestException as e:
             raise Exception(f"Error calling LLM API: {e}")
-        except KeyError as e:
+        except (KeyError, IndexError, orjson.JSONDecodeError) as e:
             raise Exception(f"Unexpected API response format: {e}")
     
+    @staticmethod
+    def _is_event_stream(response) -> bool:
+        """Check whether the API actually answered with server-sent events."""
+        return response.headers.get("Content-Type", "").startswith("text/event-stream")
+    
+    @staticmethod
+    def _iter_deltas(response) -> Iterator[str]:
+        """Yield the completion text deltas of a streamed (SSE) response."""
+        for line in response.iter_lines():
+            if not line.startswith(b"data: "):
+                continue
+            data = line[6:]
+            if data == b"[DONE]":
+                break
+            
+            delta = orjson.loads(data)["choices"][0]["delta"].get("content")
+            if delta:
+                yield delta
+    
+    @classmethod
+    def _read_stream(cls, response) -> str:
+        """Collect streamed (SSE) completion text, stopping once a code block is closed."""
+        chunks = []
+        for delta in cls._iter_deltas(response):
+            chunks.append(delta)
+            
+            # Anything after the closing fence is prose we would strip anyway. Only a
+            # fence at the start of a line closes the block, not one inside a string.
+            if "`" in delta:
+                text = "".join(chunks)
+                opening = text.find("```")
+                closing = text.find("\n```", opening + 3) if opening != -1 else -1
+                if closing != -1:
+                    return text[:closing + 4]
+        
+        return "".join(chunks)
+    
+    async def generate_code_async(self, problem_statement: str) -> str:
+        """
+        Generate code without blocking the event loop
+        
+        Args:
+            problem_statement: Description of the problem to solve
+            
+        Returns:
+            Generated Python code as string
+        """
+        import asyncio
+        
+        return await asyncio.to_thread(self.generate_code, problem_statement)
+    
     def execute_code(self, code: str, timeout: int = 30) -> Dict[str, Any]:
         """
         Execute the generated Python code safely
@@ -117,24 +331,25 @@ Generate the Python code:
         Returns:
             Dictionary with execution results including stdout, stderr, and return code
         """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            temp_file = f.name
+        try:
+            # Execute the code in a fresh, isolated interpreter fed via stdin
+            worker = _WORKERS.acquire(self.runtime)
+        except Exception as e:
+            return {
+                "returncode": -1,
+                "stdout": "",
+                "stderr": f"Execution error: {str(e)}",
+                "success": False
+            }
         
         try:
-            # Execute the code in a subprocess for safety
-            result = subprocess.run(
-                [sys.executable, temp_file],
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            stdout, stderr = worker.communicate(input=code, timeout=timeout)
             
             return {
-                "returncode": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "success": result.returncode == 0
+                "returncode": worker.returncode,
+                "stdout": stdout,
+                "stderr": stderr,
+                "success": worker.returncode == 0
             }
             
         except subprocess.TimeoutExpired:
@@ -152,11 +367,9 @@ Generate the Python code:
                 "success": False
             }
         finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file)
-            except OSError:
-                pass
+            if worker.poll() is None:
+                worker.kill()
+                worker.communicate()
     
     def solve_problem(self, problem_statement: str, execute: bool = True, timeout: int = 30) -> Dict[str, Any]:
         """
@@ -171,8 +384,18 @@ Generate the Python code:
             Dictionary with generated code and execution results
         """
         try:
+            if execute:
+                # Boot the interpreter while we wait on the LLM
+                _WORKERS.prewarm(self.runtime)
+            
             print(f"Generating code for: {problem_statement}")
-            code = self.generate_code(problem_statement)
+            try:
+                code = self.generate_code(problem_statement, stream=True)
+            except Exception:
+                if execute:
+                    # Don't leave the prewarmed interpreter idling until exit
+                    _WORKERS.discard(self.runtime)
+                raise
             
             result = {
                 "problem": problem_statement,
@@ -194,6 +417,25 @@ Generate the Python code:
                 "execution": None,
                 "error": str(e)
             }
+    
+    async def solve_many(self, problems: List[str], execute: bool = True, timeout: int = 30) -> List[Dict[str, Any]]:
+        """
+        Solve several problems concurrently, overlapping their API round-trips
+        
+        Args:
+            problems: Problem statements to solve
+            execute: Whether to execute the generated code
+            timeout: Maximum execution time in seconds
+            
+        Returns:
+            List of solve_problem results, in the same order as problems
+        """
+        import asyncio
+        
+        return await asyncio.gather(*(
+            asyncio.to_thread(self.solve_problem, problem, execute, timeout)
+            for problem in problems
+        ))
 
 
 def main():
@@ -204,11 +446,17 @@ def main():
     parser.add_argument("--model", default="openai", help="Model provider to use (openai, claude, gemini)")
     parser.add_argument("--api-key", help="OpenAI API key (or set OPENAI_API_KEY env var)")
     parser.add_argument("--output", help="Save results to JSON file")
+    parser.add_argument("--runtime", default=sys.executable,
+                        help="Python interpreter for executing generated code (e.g. pypy3)")
     
     args = parser.parse_args()
     
+    runtime = shutil.which(args.runtime)
+    if not runtime:
+        parser.error(f"runtime '{args.runtime}' not found")
+    
     try:
-        generator = LLMCodeGenerator(api_key=args.api_key, model=args.model)
+        generator = LLMCodeGenerator(api_key=args.api_key, model=args.model, runtime=runtime)
         result = generator.solve_problem(
             args.problem, 
             execute=not args.no_execute, 
@@ -219,29 +467,33 @@ def main():
             print(f"Error: {result['error']}")
             sys.exit(1)
         
-        print("\n" + "="*50)
-        print("GENERATED CODE:")
-        print("="*50)
-        print(result["generated_code"])
+        lines = [
+            "\n" + "="*50,
+            "GENERATED CODE:",
+            "="*50,
+            result["generated_code"]
+        ]
         
         if result["execution"]:
-            print("\n" + "="*50)
-            print("EXECUTION RESULTS:")
-            print("="*50)
+            lines += ["\n" + "="*50, "EXECUTION RESULTS:", "="*50]
             if result["execution"]["success"]:
-                print("✅ Execution successful!")
+                lines.append("✅ Execution successful!")
                 if result["execution"]["stdout"]:
-                    print("Output:")
-                    print(result["execution"]["stdout"])
+                    lines += ["Output:", result["execution"]["stdout"]]
             else:
-                print("❌ Execution failed!")
+                lines.append("❌ Execution failed!")
                 if result["execution"]["stderr"]:
-                    print("Error:")
-                    print(result["execution"]["stderr"])
+                    lines += ["Error:", result["execution"]["stderr"]]
+        
+        # Emit the report in a single write
+        print("\n".join(lines))
         
         if args.output:
-            with open(args.output, 'w') as f:
-                json.dump(result, f, indent=2)
+            # Write to a sibling temp file and rename so a crash never leaves a partial file
+            tmp_output = args.output + '.tmp'
+            with open(tmp_output, 'wb') as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_output, args.output)
             print(f"\nResults saved to {args.output}")
     
     except Exception as e:
@@ -8,47 +8,73 @@ Main entry point for repository operations.
 import argparse
 import sys
 import json
-from repo_code_generator import RepoCodeGenerator
 
 
-def main():
-    parser = argparse.ArgumentParser(description="LLM-powered repository code generator")
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
-    
-    # Analyze command
+def _build_analyze_parser(subparsers) -> None:
     analyze_parser = subparsers.add_parser('analyze', help='Analyze a repository')
     analyze_parser.add_argument('repo_url', help='Git repository URL')
     analyze_parser.add_argument('--branch', default='main', help='Branch to analyze')
     analyze_parser.add_argument('--model', default='openai', help='Model provider to use')
-    
-    # Summary command
+
+
+def _build_summary_parser(subparsers) -> None:
     summary_parser = subparsers.add_parser('summary', help='Generate repository summary')
     summary_parser.add_argument('repo_url', help='Git repository URL')
     summary_parser.add_argument('--branch', default='main', help='Branch to analyze')
     summary_parser.add_argument('--model', default='openai', help='Model provider to use')
-    
-    # Improve command
+    summary_parser.add_argument('--no-cache', action='store_true', help='Ignore cached LLM responses')
+
+
+def _build_improve_parser(subparsers) -> None:
     improve_parser = subparsers.add_parser('improve', help='Suggest improvements')
     improve_parser.add_argument('repo_url', help='Git repository URL')
     improve_parser.add_argument('--focus', default='', help='Focus area (e.g., performance, security)')
     improve_parser.add_argument('--branch', default='main', help='Branch to analyze')
     improve_parser.add_argument('--model', default='openai', help='Model provider to use')
-    
-    # Feature command
+    improve_parser.add_argument('--no-cache', action='store_true', help='Ignore cached LLM responses')
+
+
+def _build_feature_parser(subparsers) -> None:
     feature_parser = subparsers.add_parser('feature', help='Implement a new feature')
     feature_parser.add_argument('repo_url', help='Git repository URL')
     feature_parser.add_argument('description', help='Feature description')
     feature_parser.add_argument('--branch', default='main', help='Base branch')
     feature_parser.add_argument('--create-pr', action='store_true', help='Create new branch for PR')
     feature_parser.add_argument('--model', default='openai', help='Model provider to use')
-    
-    # Fix command
+    feature_parser.add_argument('--no-cache', action='store_true', help='Ignore cached LLM responses')
+
+
+def _build_fix_parser(subparsers) -> None:
     fix_parser = subparsers.add_parser('fix', help='Fix issues in repository')
     fix_parser.add_argument('repo_url', help='Git repository URL')
     fix_parser.add_argument('description', help='Issue description')
     fix_parser.add_argument('--branch', default='main', help='Base branch')
     fix_parser.add_argument('--create-pr', action='store_true', help='Create new branch for PR')
     fix_parser.add_argument('--model', default='openai', help='Model provider to use')
+    fix_parser.add_argument('--no-cache', action='store_true', help='Ignore cached LLM responses')
+
+
+_SUBPARSER_BUILDERS = {
+    'analyze': _build_analyze_parser,
+    'summary': _build_summary_parser,
+    'improve': _build_improve_parser,
+    'feature': _build_feature_parser,
+    'fix': _build_fix_parser,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM-powered repository code generator")
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+    
+    # Only build the subparser for the requested command; help and usage
+    # errors fall back to building all of them.
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command in _SUBPARSER_BUILDERS:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in _SUBPARSER_BUILDERS.values():
+            build(subparsers)
     
     args = parser.parse_args()
     
@@ -57,36 +83,41 @@ def main():
         return
     
     try:
-        generator = RepoCodeGenerator(model=args.model)
+        # Imported after argument parsing so --help and usage errors stay fast
+        from repo_code_generator import RepoCodeGenerator
+        
+        generator = RepoCodeGenerator(model=args.model, use_cache=not getattr(args, 'no_cache', False))
         
         if args.command == 'analyze':
             print(f"Analyzing repository: {args.repo_url}")
             analysis = generator.analyze_repository(args.repo_url, args.branch)
             
-            print("\n" + "="*60)
-            print("REPOSITORY ANALYSIS")
-            print("="*60)
-            print(f"Path: {analysis['path']}")
-            print(f"Files: {len(analysis['files'])}")
-            print(f"Size: {analysis['size']} bytes")
-            print(f"Languages: {', '.join(analysis['languages'].keys())}")
+            languages = analysis['languages']
+            
+            lines = ["\n" + "="*60, "REPOSITORY ANALYSIS", "="*60]
+            lines.append(f"Path: {analysis['path']}")
+            lines.append(f"Files: {len(analysis['files'])}")
+            lines.append(f"Size: {analysis['size']} bytes")
+            lines.append(f"Languages: {', '.join(languages)}")
             
             if analysis.get('git_info'):
-                print(f"Branch: {analysis['git_info'].get('current_branch', 'unknown')}")
-                print(f"Remote: {analysis['git_info'].get('remote_url', 'unknown')}")
+                lines.append(f"Branch: {analysis['git_info'].get('current_branch', 'unknown')}")
+                lines.append(f"Remote: {analysis['git_info'].get('remote_url', 'unknown')}")
+            
+            lines.append(f"\nTop file types:")
+            for ext, count in languages.most_common(5):
+                lines.append(f"  {ext}: {count} files")
             
-            print(f"\nTop file types:")
-            for ext, count in sorted(analysis['languages'].items(), key=lambda x: x[1], reverse=True)[:5]:
-                print(f"  {ext}: {count} files")
+            print("\n".join(lines))
         
         elif args.command == 'summary':
             print(f"Generating summary for: {args.repo_url}")
             summary = generator.generate_repository_summary(args.repo_url, args.branch)
             
-            print("\n" + "="*60)
-            print("REPOSITORY SUMMARY")
-            print("="*60)
-            print(summary)
+            lines = ["\n" + "="*60, "REPOSITORY SUMMARY", "="*60]
+            lines.append(summary)
+            
+            print("\n".join(lines))
         
         elif args.command == 'improve':
             print(f"Generating improvements for: {args.repo_url}")
@@ -95,10 +126,10 @@ def main():
             
             improvements = generator.suggest_improvements(args.repo_url, args.focus, args.branch)
             
-            print("\n" + "="*60)
-            print("IMPROVEMENT SUGGESTIONS")
-            print("="*60)
-            print(improvements)
+            lines = ["\n" + "="*60, "IMPROVEMENT SUGGESTIONS", "="*60]
+            lines.append(improvements)
+            
+            print("\n".join(lines))
         
         elif args.command == 'feature':
             print(f"Implementing feature in: {args.repo_url}")
@@ -111,32 +142,41 @@ def main():
                 args.create_pr
             )
             
-            print("\n" + "="*60)
-            print("FEATURE IMPLEMENTATION")
-            print("="*60)
+            lines = ["\n" + "="*60, "FEATURE IMPLEMENTATION", "="*60]
             
-            if result['success']:
-                print("✅ Feature implemented successfully!")
-                print(f"Modified files: {', '.join(result['modified_files'])}")
-                print(f"Working in: {result['repo_path']}")
+            if result['success'] and (result['modified_files'] or not result['failed_files']):
+                lines.append("✅ Feature implemented successfully!")
+                lines.append(f"Modified files: {', '.join(result['modified_files'])}")
+                if result['failed_files']:
+                    lines.append(f"⚠️  Could not apply changes to: {', '.join(result['failed_files'])}")
+                lines.append(f"Working in: {result['repo_path']}")
                 
                 if args.create_pr:
-                    print(f"Created branch: {result['branch']}")
-                    print("Ready for push and PR creation!")
+                    lines.append(f"Created branch: {result['branch']}")
+                    lines.append("Ready for push and PR creation!")
                 
                 # Show implementation details
                 impl = result['implementation']
                 if impl.get('plan'):
-                    print(f"\nImplementation plan:\n{impl['plan']}")
+                    lines.append(f"\nImplementation plan:\n{impl['plan']}")
                 
                 if impl.get('dependencies'):
-                    print(f"\nNew dependencies: {', '.join(impl['dependencies'])}")
+                    lines.append(f"\nNew dependencies: {', '.join(impl['dependencies'])}")
+                
+            elif result['success']:
+                lines.append("❌ Feature implementation failed!")
+                lines.append(f"None of the changes could be applied: {', '.join(result['failed_files'])}")
                 
             else:
-                print("❌ Feature implementation failed!")
-                print(f"Error: {result['error']}")
+                lines.append("❌ Feature implementation failed!")
+                lines.append(f"Error: {result['error']}")
+                if result.get('modified_files'):
+                    lines.append(f"Files already written before the failure: {', '.join(result['modified_files'])}")
+                    lines.append(f"Working in: {result['repo_path']}")
                 if result.get('raw_response'):
-                    print(f"Raw response:\n{result['raw_response']}")
+                    lines.append(f"Raw response:\n{result['raw_response']}")
+            
+            print("\n".join(lines))
         
         elif args.command == 'fix':
             print(f"Fixing issues in: {args.repo_url}")
@@ -149,33 +189,40 @@ def main():
                 args.create_pr
             )
             
-            print("\n" + "="*60)
-            print("ISSUE FIXES")
-            print("="*60)
+            lines = ["\n" + "="*60, "ISSUE FIXES", "="*60]
             
-            if result['success']:
-                print("✅ Issues fixed successfully!")
-                print(f"Fixed files: {', '.join(result['fixed_files'])}")
-                print(f"Working in: {result['repo_path']}")
+            if result['success'] and (result['fixed_files'] or not result['failed_files']):
+                lines.append("✅ Issues fixed successfully!")
+                lines.append(f"Fixed files: {', '.join(result['fixed_files'])}")
+                if result['failed_files']:
+                    lines.append(f"⚠️  Could not apply fixes to: {', '.join(result['failed_files'])}")
+                lines.append(f"Working in: {result['repo_path']}")
                 
                 if args.create_pr:
-                    print(f"Created branch: {result['branch']}")
-                    print("Ready for push and PR creation!")
+                    lines.append(f"Created branch: {result['branch']}")
+                    lines.append("Ready for push and PR creation!")
                 
                 # Show fix details
                 fixes = result['fixes']
                 if fixes.get('analysis'):
-                    print(f"\nProblem analysis:\n{fixes['analysis']}")
+                    lines.append(f"\nProblem analysis:\n{fixes['analysis']}")
                 
-                print(f"\nFixes applied:")
+                lines.append(f"\nFixes applied:")
                 for fix_info in fixes.get('fixes', []):
-                    print(f"- {fix_info['file']}: {fix_info['solution']}")
+                    if fix_info['file'] in result['fixed_files']:
+                        lines.append(f"- {fix_info['file']}: {fix_info['solution']}")
+                
+            elif result['success']:
+                lines.append("❌ Issue fixing failed!")
+                lines.append(f"None of the fixes could be applied: {', '.join(result['failed_files'])}")
                 
             else:
-                print("❌ Issue fixing failed!")
-                print(f"Error: {result['error']}")
+                lines.append("❌ Issue fixing failed!")
+                lines.append(f"Error: {result['error']}")
                 if result.get('raw_response'):
-                    print(f"Raw response:\n{result['raw_response']}")
+                    lines.append(f"Raw response:\n{result['raw_response']}")
+            
+            print("\n".join(lines))
         
         # Cleanup
         generator.cleanup()
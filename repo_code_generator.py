@@ -7,38 +7,256 @@ perform multi-file analysis and modifications.
 """
 
 import os
+import re
 import json
-from typing import Dict, List, Optional, Any
+import orjson
+from typing import Dict, List, Optional, Any, Tuple
 from llm_code_generator import LLMCodeGenerator
+from llm_cache import LLMCache
 from repo_manager import RepoManager
 from config_reader import load_config
 
 
+# A markdown fence wrapping the whole response, or closing it after some prose.
+# Fences are only recognised at the start of a line: inside JSON strings newlines
+# are escaped, so fenced snippets in file contents can't be mistaken for them.
+_JSON_FENCE_START_RE = re.compile(r"\A\s*```(?:json)?[ \t]*\n(.*?)(?:\n```\s*)?\Z", re.DOTALL)
+_JSON_FENCE_END_RE = re.compile(r"\n```(?:json)?[ \t]*\n(.*)\n```\s*\Z", re.DOTALL)
+
+# Prompt pieces, assembled with "".join() around the repository context. The
+# static context follows the header directly so that the header plus context
+# form a byte-identical prefix across calls on the same repository.
+_TASK_MARKER = "\n\n=== TASK ===\n"
+
+_SUMMARY_HEADER = """
+Analyze this repository and provide a comprehensive summary:
+
+"""
+
+_SUMMARY_INSTRUCTIONS = """
+
+Please provide:
+1. Project overview and purpose
+2. Main technologies and frameworks used
+3. Architecture and structure analysis
+4. Key components and their relationships
+5. Potential improvements or issues
+6. Development recommendations
+
+Make your analysis detailed but concise.
+
+"""
+
+_IMPROVE_HEADER = """
+Analyze this repository and suggest specific improvements:
+
+"""
+
+_IMPROVE_INSTRUCTIONS = """
+
+Please provide:
+1. Code quality improvements
+2. Architecture enhancements
+3. Performance optimizations
+4. Security considerations
+5. Testing improvements
+6. Documentation suggestions
+7. Specific code changes with examples
+
+Provide actionable recommendations with code examples where applicable.
+
+"""
+
+_IMPL_HEADER = """
+Based on this repository structure, implement the feature described under TASK.
+
+REPOSITORY CONTEXT:
+"""
+
+_IMPL_SCHEMA = """
+
+Please provide a detailed implementation plan with:
+1. List of files to modify/create
+2. Specific code changes for each file
+3. Any new dependencies or configurations needed
+4. Testing considerations
+
+Format your response as JSON with this structure:
+{
+    "plan": "Overall implementation strategy",
+    "files": [
+        {
+            "path": "relative/path/to/file.py",
+            "action": "create|modify",
+            "diff": "unified diff against the current file (modify only)",
+            "content": "complete file content (create only)",
+            "description": "what this file does"
+        }
+    ],
+    "dependencies": ["list", "of", "new", "dependencies"],
+    "tests": ["list", "of", "test", "files", "to", "create"],
+    "notes": "additional implementation notes"
+}
+
+For "modify" give a unified diff with a few lines of unchanged context around
+every hunk instead of the whole file; only "create" needs "content".
+
+"""
+
+_FIX_HEADER = """
+Analyze this repository and fix the issues described under TASK.
+
+REPOSITORY CONTEXT:
+"""
+
+_FIX_SCHEMA = """
+
+Please provide specific fixes with:
+1. Identification of the problems
+2. Root cause analysis
+3. Specific code changes needed
+4. Files to modify
+
+Format your response as JSON with this structure:
+{
+    "analysis": "problem analysis and root causes",
+    "fixes": [
+        {
+            "file": "path/to/file.py",
+            "issue": "description of issue in this file",
+            "solution": "description of fix",
+            "diff": "unified diff of the fix against the current file"
+        }
+    ],
+    "tests": ["suggested test changes"],
+    "notes": "additional notes about the fixes"
+}
+
+Give each fix as a unified diff with a few lines of unchanged context around
+every hunk. Only use "content" with the complete file instead of "diff" if the
+file is new or almost entirely rewritten.
+
+"""
+
+
+def _robust_json_load(text: str) -> Any:
+    """
+    Parse JSON from an LLM response, tolerating markdown fences and surrounding
+    prose rather than giving up (which would cost another LLM round-trip).
+    
+    Falls back to json5, if installed, for trailing commas, comments and the like.
+    
+    Raises:
+        orjson.JSONDecodeError: If no candidate could be parsed
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError as e:
+        error = e
+    
+    candidates = []
+    start, end = text.find('{'), text.rfind('}')
+    if start != -1 and end > start:
+        candidates.append(text[start:end + 1])
+    for fence_re in (_JSON_FENCE_START_RE, _JSON_FENCE_END_RE):
+        fenced = fence_re.search(text)
+        if fenced:
+            candidates.append(fenced.group(1))
+    
+    for candidate in candidates:
+        try:
+            return orjson.loads(candidate)
+        except orjson.JSONDecodeError:
+            pass
+    
+    # Prose after the object that itself contains a '}' defeats the slice above;
+    # raw_decode parses the first complete value and ignores whatever follows
+    if start != -1:
+        try:
+            return json.JSONDecoder().raw_decode(text, start)[0]
+        except ValueError:
+            pass
+    
+    try:
+        import json5
+    except ImportError:
+        raise error
+    for candidate in [text] + candidates:
+        try:
+            return json5.loads(candidate)
+        except ValueError:
+            pass
+    raise error
+
+
+def _is_json_response(text: str) -> bool:
+    """Check whether _robust_json_load can make sense of an LLM response."""
+    try:
+        _robust_json_load(text)
+        return True
+    except ValueError:
+        return False
+
+
 class RepoCodeGenerator(LLMCodeGenerator):
-    def __init__(self, api_key: Optional[str] = None, model: str = "openai"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "openai",
+                 use_cache: bool = True):
         """
         Initialize repository-level code generator.
         
         Args:
             api_key: API key (optional, will load from config if not provided)
             model: Model provider to use (openai, claude, gemini)
+            use_cache: Reuse cached LLM responses for identical prompts
         """
         super().__init__(api_key, model)
         self.repo_manager = RepoManager()
+        self.cache = LLMCache() if use_cache else None
     
-    def analyze_repository(self, repo_url: str, branch: str = "main") -> Dict[str, Any]:
+    def _cached_generate(self, prompt: str, expect_json: bool = False) -> str:
+        """
+        Generate a response, serving it from the disk cache when possible.
+        
+        Args:
+            prompt: Prompt to send to the LLM
+            expect_json: Only cache (and reuse) responses that parse as JSON, so a
+                truncated or garbled reply is not replayed on every rerun
+            
+        Returns:
+            LLM response
+        """
+        if self.cache is None:
+            return self.generate_code(prompt)
+        
+        key = self.cache.make_key(self.model, prompt)
+        response = self.cache.get(key)
+        if response is None or (expect_json and not _is_json_response(response)):
+            response = self.generate_code(prompt)
+            if not expect_json or _is_json_response(response):
+                self.cache.set(key, response)
+        return response
+    
+    async def _cached_generate_async(self, prompt: str, expect_json: bool = False) -> str:
+        """Run _cached_generate in a worker thread so several calls can overlap."""
+        import asyncio
+        
+        return await asyncio.to_thread(self._cached_generate, prompt, expect_json)
+    
+    def analyze_repository(self, repo_url: str, branch: str = "main",
+                           shallow: bool = True) -> Dict[str, Any]:
         """
         Clone and analyze a repository.
         
         Args:
             repo_url: Git repository URL
             branch: Branch to analyze
+            shallow: Shallow-clone the repository (use False if changes will be pushed)
             
         Returns:
             Repository analysis results
         """
         print(f"Cloning repository: {repo_url}")
-        clone_path = self.repo_manager.clone_repository(repo_url, branch)
+        clone_path = self.repo_manager.clone_repository(repo_url, branch, shallow)
         
         print("Analyzing repository structure...")
         analysis = self.repo_manager.analyze_repository()
@@ -56,27 +274,15 @@ class RepoCodeGenerator(LLMCodeGenerator):
         Returns:
             LLM-generated repository summary
         """
-        # Get repository context
-        self.analyze_repository(repo_url, branch)
-        context = self.repo_manager.get_repository_context()
+        # Get repository context (static part first so it forms a cacheable prompt prefix)
+        analysis = self.analyze_repository(repo_url, branch)
+        static_context = self.repo_manager.get_static_context(analysis=analysis)
+        dynamic_context = self.repo_manager.get_dynamic_context(analysis)
         
-        prompt = f"""
-Analyze this repository and provide a comprehensive summary:
-
-{context}
-
-Please provide:
-1. Project overview and purpose
-2. Main technologies and frameworks used
-3. Architecture and structure analysis
-4. Key components and their relationships
-5. Potential improvements or issues
-6. Development recommendations
-
-Make your analysis detailed but concise.
-"""
+        prompt = "".join([_SUMMARY_HEADER, static_context, _SUMMARY_INSTRUCTIONS,
+                          dynamic_context, "\n"])
         
-        return self.generate_code(prompt)
+        return self._cached_generate(prompt)
     
     def suggest_improvements(self, repo_url: str, focus_area: str = "", branch: str = "main") -> str:
         """
@@ -90,31 +296,13 @@ Make your analysis detailed but concise.
         Returns:
             LLM-generated improvement suggestions
         """
-        self.analyze_repository(repo_url, branch)
-        context = self.repo_manager.get_repository_context()
+        analysis = self.analyze_repository(repo_url, branch)
+        static_context = self.repo_manager.get_static_context(analysis=analysis)
+        dynamic_context = self.repo_manager.get_dynamic_context(analysis)
         
-        focus_text = f"Focus specifically on: {focus_area}" if focus_area else "Consider all aspects"
+        prompt = self._improvements_prompt(static_context, dynamic_context, focus_area)
         
-        prompt = f"""
-Analyze this repository and suggest specific improvements:
-
-{context}
-
-{focus_text}
-
-Please provide:
-1. Code quality improvements
-2. Architecture enhancements
-3. Performance optimizations
-4. Security considerations
-5. Testing improvements
-6. Documentation suggestions
-7. Specific code changes with examples
-
-Provide actionable recommendations with code examples where applicable.
-"""
-        
-        return self.generate_code(prompt)
+        return self._cached_generate(prompt)
     
     def implement_feature(self, repo_url: str, feature_description: str, 
                          branch: str = "main", create_pr: bool = False) -> Dict[str, Any]:
@@ -131,86 +319,24 @@ Provide actionable recommendations with code examples where applicable.
             Implementation results including modified files
         """
         # Analyze repository
-        self.analyze_repository(repo_url, branch)
-        context = self.repo_manager.get_repository_context()
+        analysis = self.analyze_repository(repo_url, branch, shallow=not create_pr)
+        static_context = self.repo_manager.get_static_context(analysis=analysis)
+        dynamic_context = self.repo_manager.get_dynamic_context(analysis)
         
         # Create new branch if requested
+        feature_branch = None
         if create_pr:
             feature_branch = f"feature/{feature_description.lower().replace(' ', '-')[:30]}"
             self.repo_manager.create_branch(feature_branch)
         
         # Generate implementation plan
-        prompt = f"""
-Based on this repository structure, implement the following feature:
-
-FEATURE: {feature_description}
-
-REPOSITORY CONTEXT:
-{context}
-
-Please provide a detailed implementation plan with:
-1. List of files to modify/create
-2. Specific code changes for each file
-3. Any new dependencies or configurations needed
-4. Testing considerations
-
-Format your response as JSON with this structure:
-{{
-    "plan": "Overall implementation strategy",
-    "files": [
-        {{
-            "path": "relative/path/to/file.py",
-            "action": "create|modify",
-            "content": "complete file content",
-            "description": "what this file does"
-        }}
-    ],
-    "dependencies": ["list", "of", "new", "dependencies"],
-    "tests": ["list", "of", "test", "files", "to", "create"],
-    "notes": "additional implementation notes"
-}}
-"""
+        prompt = self._feature_prompt(static_context, dynamic_context, feature_description)
         
         print("Generating implementation plan...")
-        implementation_response = self.generate_code(prompt)
+        implementation_response, written, failed = self._stream_implementation(prompt)
         
-        try:
-            # Parse JSON response
-            implementation = json.loads(implementation_response)
-            
-            # Apply file changes
-            modified_files = []
-            for file_info in implementation.get("files", []):
-                file_path = file_info["path"]
-                content = file_info["content"]
-                
-                print(f"{'Creating' if file_info['action'] == 'create' else 'Modifying'}: {file_path}")
-                self.repo_manager.write_file(file_path, content)
-                modified_files.append(file_path)
-            
-            # Commit changes if in PR mode
-            if create_pr:
-                commit_message = f"Implement {feature_description}\n\nGenerated implementation including:\n"
-                for file_info in implementation.get("files", []):
-                    commit_message += f"- {file_info['action'].title()} {file_info['path']}\n"
-                
-                self.repo_manager.commit_changes(commit_message)
-                print(f"Changes committed to branch: {feature_branch}")
-            
-            return {
-                "success": True,
-                "implementation": implementation,
-                "modified_files": modified_files,
-                "branch": feature_branch if create_pr else branch,
-                "repo_path": self.repo_manager.repo_path
-            }
-            
-        except json.JSONDecodeError as e:
-            return {
-                "success": False,
-                "error": f"Failed to parse implementation response: {e}",
-                "raw_response": implementation_response
-            }
+        return self._apply_implementation(implementation_response, feature_description,
+                                          branch, feature_branch, written, failed)
     
     def fix_issues(self, repo_url: str, issue_description: str, 
                    branch: str = "main", create_pr: bool = False) -> Dict[str, Any]:
@@ -227,8 +353,9 @@ Format your response as JSON with this structure:
             Fix results including modified files
         """
         # Analyze repository
-        self.analyze_repository(repo_url, branch)
-        context = self.repo_manager.get_repository_context()
+        analysis = self.analyze_repository(repo_url, branch, shallow=not create_pr)
+        static_context = self.repo_manager.get_static_context(analysis=analysis)
+        dynamic_context = self.repo_manager.get_dynamic_context(analysis)
         
         # Create new branch if requested
         if create_pr:
@@ -236,78 +363,281 @@ Format your response as JSON with this structure:
             self.repo_manager.create_branch(fix_branch)
         
         # Generate fix plan
-        prompt = f"""
-Analyze this repository and fix the following issues:
-
-ISSUES: {issue_description}
-
-REPOSITORY CONTEXT:
-{context}
-
-Please provide specific fixes with:
-1. Identification of the problems
-2. Root cause analysis
-3. Specific code changes needed
-4. Files to modify
-
-Format your response as JSON with this structure:
-{{
-    "analysis": "problem analysis and root causes",
-    "fixes": [
-        {{
-            "file": "path/to/file.py",
-            "issue": "description of issue in this file",
-            "solution": "description of fix",
-            "content": "complete fixed file content"
-        }}
-    ],
-    "tests": ["suggested test changes"],
-    "notes": "additional notes about the fixes"
-}}
-"""
+        prompt = self._fix_prompt(static_context, dynamic_context, issue_description)
         
         print("Analyzing issues and generating fixes...")
-        fix_response = self.generate_code(prompt)
+        fix_response = self._cached_generate(prompt, expect_json=True)
         
         try:
             # Parse JSON response
-            fixes = json.loads(fix_response)
+            fixes = _robust_json_load(fix_response)
             
             # Apply fixes
-            fixed_files = []
             for fix_info in fixes.get("fixes", []):
-                file_path = fix_info["file"]
-                content = fix_info["content"]
-                
-                print(f"Fixing: {file_path} - {fix_info['issue']}")
-                self.repo_manager.write_file(file_path, content)
-                fixed_files.append(file_path)
+                print(f"Fixing: {fix_info['file']} - {fix_info['issue']}")
+            fixed_files, failed_files = self._resolve_changes(fixes.get("fixes", []), "file")
+            
+            self.repo_manager.write_files(fixed_files)
+            fixed_files = [file_path for file_path, _ in fixed_files]
             
             # Commit changes if in PR mode
             if create_pr:
                 commit_message = f"Fix: {issue_description}\n\n"
                 commit_message += fixes.get("analysis", "") + "\n\n"
-                for fix_info in fixes.get("fixes", []):
+                for fix_info in sorted(fixes.get("fixes", []), key=lambda f: f["file"]):
                     commit_message += f"- {fix_info['file']}: {fix_info['solution']}\n"
                 
-                self.repo_manager.commit_changes(commit_message)
-                print(f"Fixes committed to branch: {fix_branch}")
+                if self.repo_manager.commit_changes(commit_message):
+                    print(f"Fixes committed to branch: {fix_branch}")
+                else:
+                    print("No changes committed")
             
             return {
                 "success": True,
                 "fixes": fixes,
                 "fixed_files": fixed_files,
+                "failed_files": failed_files,
                 "branch": fix_branch if create_pr else branch,
                 "repo_path": self.repo_manager.repo_path
             }
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             return {
                 "success": False,
                 "error": f"Failed to parse fix response: {e}",
                 "raw_response": fix_response
             }
     
+    async def implement_and_suggest(self, repo_url: str, feature_description: str,
+                                    focus_area: str = "", branch: str = "main",
+                                    create_pr: bool = False) -> Dict[str, Any]:
+        """
+        Implement a feature and suggest improvements with one repository analysis,
+        running both LLM calls concurrently.
+        
+        Args:
+            repo_url: Git repository URL
+            feature_description: Description of feature to implement
+            focus_area: Specific area to focus improvement suggestions on
+            branch: Base branch to work from
+            create_pr: Whether to create a new branch and prepare for PR
+            
+        Returns:
+            Dictionary with "implementation" (as from implement_feature) and
+            "improvements" (as from suggest_improvements)
+        """
+        analysis = self.analyze_repository(repo_url, branch, shallow=not create_pr)
+        static_context = self.repo_manager.get_static_context(analysis=analysis)
+        dynamic_context = self.repo_manager.get_dynamic_context(analysis)
+        
+        feature_branch = None
+        if create_pr:
+            feature_branch = f"feature/{feature_description.lower().replace(' ', '-')[:30]}"
+            self.repo_manager.create_branch(feature_branch)
+        
+        import asyncio
+        
+        print("Generating implementation plan and improvement suggestions...")
+        implementation_response, improvements = await asyncio.gather(
+            self._cached_generate_async(
+                self._feature_prompt(static_context, dynamic_context, feature_description),
+                expect_json=True),
+            self._cached_generate_async(
+                self._improvements_prompt(static_context, dynamic_context, focus_area))
+        )
+        
+        return {
+            "implementation": self._apply_implementation(implementation_response, feature_description,
+                                                         branch, feature_branch),
+            "improvements": improvements
+        }
+    
+    def _improvements_prompt(self, static_context: str, dynamic_context: str, focus_area: str) -> str:
+        """Build the prompt for suggest_improvements."""
+        focus_text = f"Focus specifically on: {focus_area}" if focus_area else "Consider all aspects"
+        
+        return "".join([_IMPROVE_HEADER, static_context, _IMPROVE_INSTRUCTIONS,
+                        dynamic_context, _TASK_MARKER, focus_text, "\n"])
+    
+    def _feature_prompt(self, static_context: str, dynamic_context: str, feature_description: str) -> str:
+        """Build the prompt for implement_feature."""
+        return "".join([_IMPL_HEADER, static_context, _IMPL_SCHEMA,
+                        dynamic_context, _TASK_MARKER, "FEATURE: ", feature_description, "\n"])
+    
+    def _fix_prompt(self, static_context: str, dynamic_context: str, issue_description: str) -> str:
+        """Build the prompt for fix_issues."""
+        return "".join([_FIX_HEADER, static_context, _FIX_SCHEMA,
+                        dynamic_context, _TASK_MARKER, "ISSUES: ", issue_description, "\n"])
+    
+    def _stream_implementation(self, prompt: str) -> Tuple[str, List[str], List[str]]:
+        """
+        Generate the implementation response, writing each file to the repository
+        as soon as its entry in the streamed JSON is complete.
+        
+        Needs ijson for incremental parsing; without it (or on a cache hit) the
+        response is generated in one piece and nothing is written here.
+        
+        Args:
+            prompt: Feature implementation prompt
+            
+        Returns:
+            Tuple of (full LLM response, paths already written, paths whose
+            change could not be applied)
+        """
+        try:
+            import ijson
+        except ImportError:
+            return self._cached_generate(prompt, expect_json=True), [], []
+        
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(self.model, prompt)
+            response = self.cache.get(key)
+            if response is not None and _is_json_response(response):
+                return response, [], []
+        
+        chunks = []
+        written = []
+        failed = []
+        entries = ijson.sendable_list()
+        parser = ijson.items_coro(entries, "files.item")
+        started = False
+        
+        for delta in self.generate_code_stream(prompt):
+            chunks.append(delta)
+            if parser is None:
+                continue
+            
+            # Skip any markdown fence or prose before the JSON object
+            if not started:
+                start = delta.find("{")
+                if start == -1:
+                    continue
+                delta = delta[start:]
+                started = True
+            
+            try:
+                parser.send(delta.encode())
+            except ijson.JSONError:
+                # Trailing prose or malformed JSON; the full response is parsed afterwards
+                parser = None
+            
+            for file_info in entries:
+                print(f"{'Creating' if file_info['action'] == 'create' else 'Modifying'}: {file_info['path']}")
+                resolved, unresolved = self._resolve_changes([file_info], "path")
+                if resolved:
+                    self.repo_manager.write_file(*resolved[0])
+                written.extend(file_path for file_path, _ in resolved)
+                failed.extend(unresolved)
+            del entries[:]
+        
+        response = "".join(chunks)
+        if key is not None and _is_json_response(response):
+            self.cache.set(key, response)
+        return response, written, failed
+    
+    def _apply_implementation(self, implementation_response: str, feature_description: str,
+                              branch: str, feature_branch: Optional[str],
+                              written: Optional[List[str]] = None,
+                              failed: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Parse an implementation response and write its files to the repository.
+        
+        Args:
+            implementation_response: Raw LLM response for the feature prompt
+            feature_description: Description of feature to implement
+            branch: Base branch
+            feature_branch: Branch to commit to, or None to leave changes uncommitted
+            written: Paths that were already written while the response streamed in
+            failed: Paths whose change already failed to apply while streaming
+            
+        Returns:
+            Implementation results including modified files
+        """
+        try:
+            # Parse JSON response
+            implementation = _robust_json_load(implementation_response)
+            
+            # Apply file changes not already handled while streaming
+            written = written or []
+            failed = failed or []
+            pending = [file_info for file_info in implementation.get("files", [])
+                       if file_info["path"] not in written and file_info["path"] not in failed]
+            for file_info in pending:
+                print(f"{'Creating' if file_info['action'] == 'create' else 'Modifying'}: {file_info['path']}")
+            modified_files, failed_files = self._resolve_changes(pending, "path")
+            failed_files = failed + failed_files
+            
+            self.repo_manager.write_files(modified_files)
+            modified_files = written + [file_path for file_path, _ in modified_files]
+            
+            # Commit changes if in PR mode
+            if feature_branch:
+                commit_message = f"Implement {feature_description}\n\nGenerated implementation including:\n"
+                for file_info in sorted(implementation.get("files", []), key=lambda f: f["path"]):
+                    commit_message += f"- {file_info['action'].title()} {file_info['path']}\n"
+                
+                if self.repo_manager.commit_changes(commit_message):
+                    print(f"Changes committed to branch: {feature_branch}")
+                else:
+                    print("No changes committed")
+            
+            return {
+                "success": True,
+                "implementation": implementation,
+                "modified_files": modified_files,
+                "failed_files": failed_files,
+                "branch": feature_branch or branch,
+                "repo_path": self.repo_manager.repo_path
+            }
+            
+        except orjson.JSONDecodeError as e:
+            return {
+                "success": False,
+                "error": f"Failed to parse implementation response: {e}",
+                "raw_response": implementation_response,
+                # Files written while the response streamed in are still on disk
+                "modified_files": written or [],
+                "repo_path": self.repo_manager.repo_path
+            }
+    
+    def _resolve_changes(self, changes: List[Dict[str, Any]],
+                         path_key: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """
+        Turn the file changes from an LLM response into new file contents.
+        
+        Changes given as a unified diff are applied to the current file; if the
+        diff does not apply, the change's full "content" is used instead when
+        the LLM provided one.
+        
+        Args:
+            changes: File change entries from the parsed response
+            path_key: Key holding the file path in each entry ("path" or "file")
+            
+        Returns:
+            Tuple of (list of (path, new content) pairs, list of paths that could not be applied)
+        """
+        resolved = []
+        failed = []
+        for change in changes:
+            file_path = change[path_key]
+            content = None
+            
+            diff = change.get("diff")
+            if diff:
+                content = self.repo_manager.apply_diff(file_path, diff)
+                if content is None:
+                    print(f"Diff for {file_path} did not apply cleanly")
+            if content is None:
+                content = change.get("content")
+            
+            if content is None:
+                failed.append(file_path)
+            else:
+                resolved.append((file_path, content))
+        
+        return resolved, failed
+    
     def cleanup(self):
         """Clean up temporary resources."""
         self.repo_manager.cleanup()
\ No newline at end of file
@@ -6,54 +6,145 @@ Handles git repository operations, cloning, analysis, and multi-file modificatio
 """
 
 import os
+import re
+import atexit
 import subprocess
 import tempfile
 import shutil
 import json
-from typing import Dict, List, Optional, Any
-from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
 import fnmatch
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Directories never worth walking: VCS metadata, dependencies and build output
+SKIP_DIRS = frozenset({
+    '.git', 'node_modules', '.venv', 'venv', '__pycache__',
+    'dist', 'build', '.next', 'target'
+})
+
+# Files larger than this are left out of the LLM context
+MAX_CONTEXT_FILE_SIZE = 512 * 1024
 
 
 class RepoManager:
+    # Clones released by cleanup() for reuse by any RepoManager in the process:
+    # repo_url -> clone path. Clones still held by an instance are never in here.
+    _repo_cache: Dict[str, str] = {}
+    # Working directories created by RepoManager itself (never caller-provided ones)
+    _temp_dirs: set = set()
+    
     def __init__(self, work_dir: Optional[str] = None):
         """
         Initialize repository manager.
         
         Args:
-            work_dir: Working directory for repository operations
+            work_dir: Working directory for repository operations (a temporary
+                directory is created on first clone if not provided)
         """
-        self.work_dir = work_dir or tempfile.mkdtemp(prefix="llm_repo_")
+        self.work_dir = work_dir
         self.current_repo = None
         self.repo_path = None
+        # Clones this instance is working in: repo_url -> clone path
+        self._clones: Dict[str, str] = {}
+        # repo_path -> (mtime_ns, ignore spec, [(rel_path, size, extension), ...])
+        self._walk_cache: Dict[str, Tuple[int, Any, List[Tuple[str, int, str]]]] = {}
+        # repo_path -> (.gitignore mtime_ns, compiled pathspec)
+        self._ignore_cache: Dict[str, Tuple[int, Any]] = {}
     
-    def clone_repository(self, repo_url: str, branch: str = "main") -> str:
+    def clone_repository(self, repo_url: str, branch: str = "main", shallow: bool = True) -> str:
         """
         Clone a git repository.
         
+        A repository already cloned by this instance, or released by another
+        RepoManager's cleanup(), is updated in place (fetch, checkout, reset)
+        instead of being cloned again. Clones another instance is still working
+        in are never touched.
+        
         Args:
             repo_url: Git repository URL
             branch: Branch to clone (default: main)
+            shallow: Fetch only the latest commit of the branch, without
+                history (enough for analysis, not for pushing new work)
             
         Returns:
             Path to cloned repository
         """
+        cached_path = self._clones.get(repo_url) or RepoManager._repo_cache.pop(repo_url, None)
+        if cached_path and self._update_clone(cached_path, repo_url, branch, shallow):
+            self._clones[repo_url] = cached_path
+            self._walk_cache.pop(cached_path, None)
+            self.current_repo = repo_url
+            self.repo_path = cached_path
+            return cached_path
+        
+        if not self.work_dir:
+            self.work_dir = tempfile.mkdtemp(prefix="llm_repo_")
+            RepoManager._temp_dirs.add(self.work_dir)
         repo_name = repo_url.split('/')[-1].replace('.git', '')
         clone_path = os.path.join(self.work_dir, repo_name)
         
+        # Repositories with the same name share a clone path; forget whatever was there
+        for clones in (RepoManager._repo_cache, self._clones):
+            for url in [url for url, path in clones.items() if path == clone_path]:
+                del clones[url]
         if os.path.exists(clone_path):
             shutil.rmtree(clone_path)
+        self._walk_cache.pop(clone_path, None)
         
-        cmd = ["git", "clone", "-b", branch, repo_url, clone_path]
+        if shallow:
+            cmd = ["git", "clone", "--depth=1", "--single-branch", "--filter=blob:none",
+                   "-b", branch, repo_url, clone_path]
+        else:
+            cmd = ["git", "clone", "-b", branch, repo_url, clone_path]
         result = subprocess.run(cmd, capture_output=True, text=True)
         
         if result.returncode != 0:
             raise Exception(f"Failed to clone repository: {result.stderr}")
         
+        self._clones[repo_url] = clone_path
         self.current_repo = repo_url
         self.repo_path = clone_path
         return clone_path
     
+    @staticmethod
+    def _update_clone(clone_path: str, repo_url: str, branch: str, shallow: bool) -> bool:
+        """
+        Bring an existing clone to the latest commit of branch, discarding local changes.
+        
+        Args:
+            clone_path: Path to the existing clone
+            repo_url: Git repository URL the clone must have been made from
+            branch: Branch to check out
+            shallow: Fetch only the latest commit (otherwise fetch full history)
+            
+        Returns:
+            True if the clone was updated, False if it should be cloned afresh
+        """
+        if not os.path.isdir(os.path.join(clone_path, '.git')):
+            return False
+        
+        origin = subprocess.run(["git", "remote", "get-url", "origin"],
+                                cwd=clone_path, capture_output=True, text=True)
+        if origin.returncode != 0 or origin.stdout.strip() != repo_url:
+            return False
+        
+        fetch = ["git", "fetch", "origin", f"+refs/heads/{branch}:refs/remotes/origin/{branch}"]
+        if shallow:
+            fetch.insert(2, "--depth=1")
+        elif os.path.exists(os.path.join(clone_path, '.git', 'shallow')):
+            fetch.insert(2, "--unshallow")
+        
+        for cmd in (fetch,
+                    ["git", "checkout", "-f", "-B", branch, f"origin/{branch}"],
+                    ["git", "reset", "--hard", f"origin/{branch}"],
+                    ["git", "clean", "-ffdx"]):
+            result = subprocess.run(cmd, cwd=clone_path, capture_output=True, text=True)
+            if result.returncode != 0:
+                return False
+        return True
+    
     def analyze_repository(self, path: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze repository structure and content.
@@ -79,48 +170,120 @@ class RepoManager:
         
         # Get git information
         try:
-            os.chdir(repo_path)
-            
             # Get current branch
             result = subprocess.run(["git", "branch", "--show-current"], 
-                                  capture_output=True, text=True)
+                                  cwd=repo_path, capture_output=True, text=True)
             analysis["git_info"]["current_branch"] = result.stdout.strip()
             
             # Get remote URL
             result = subprocess.run(["git", "remote", "get-url", "origin"], 
-                                  capture_output=True, text=True)
+                                  cwd=repo_path, capture_output=True, text=True)
             analysis["git_info"]["remote_url"] = result.stdout.strip()
             
         except Exception as e:
             analysis["git_info"]["error"] = str(e)
         
         # Analyze file structure
-        for root, dirs, files in os.walk(repo_path):
-            # Skip .git directory
-            if '.git' in dirs:
-                dirs.remove('.git')
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, repo_path)
-                
-                # Get file info
-                file_info = {
-                    "path": rel_path,
-                    "size": os.path.getsize(file_path),
-                    "extension": Path(file).suffix.lower()
-                }
-                
-                analysis["files"].append(file_info)
-                analysis["size"] += file_info["size"]
-                
-                # Count languages by extension
-                ext = file_info["extension"]
-                if ext:
-                    analysis["languages"][ext] = analysis["languages"].get(ext, 0) + 1
+        entries = self._walk_files(repo_path)
+        analysis["files"] = [
+            {"path": rel_path, "size": size, "extension": ext}
+            for rel_path, size, ext in entries
+        ]
+        analysis["size"] = sum(size for _, size, _ in entries)
+        
+        # Count languages by extension
+        analysis["languages"] = Counter(ext for _, _, ext in entries if ext)
         
         return analysis
     
+    def _walk_files(self, repo_path: str) -> List[Tuple[str, int, str]]:
+        """
+        Walk the repository once (skipping SKIP_DIRS and anything matched by the
+        root .gitignore) and cache the result.
+        
+        The cache is keyed by the repository root's mtime and its .gitignore, and
+        is also dropped whenever this manager writes a file or re-clones the
+        repository.
+        
+        Args:
+            repo_path: Repository path
+            
+        Returns:
+            List of (relative path, size, lower-cased extension) tuples, sorted by path
+        """
+        mtime_ns = os.stat(repo_path).st_mtime_ns
+        ignore = self._ignore_spec(repo_path)
+        cached = self._walk_cache.get(repo_path)
+        if cached and cached[0] == mtime_ns and cached[1] is ignore:
+            return cached[2]
+        
+        entries = []
+        pending = [(repo_path, "")]
+        # Hot loop: bind lookups to locals
+        join = os.path.join
+        splitext = os.path.splitext
+        entries_append = entries.append
+        pending_append = pending.append
+        while pending:
+            dir_path, rel_dir = pending.pop()
+            try:
+                it = os.scandir(dir_path)
+            except OSError:
+                continue  # Unreadable directory; os.walk skipped these too
+            with it:
+                for entry in it:
+                    name = entry.name
+                    rel_path = join(rel_dir, name) if rel_dir else name
+                    if entry.is_dir(follow_symlinks=False):
+                        # Skip VCS metadata, vendored/build and ignored directories
+                        if name not in SKIP_DIRS and not (ignore and ignore.match_file(rel_path + "/")):
+                            pending_append((entry.path, rel_path))
+                    elif entry.is_file():
+                        if ignore and ignore.match_file(rel_path):
+                            continue
+                        entries_append((
+                            rel_path,
+                            entry.stat().st_size,
+                            splitext(name)[1].lower()
+                        ))
+        
+        # scandir order depends on the filesystem; sort so analysis and prompts are reproducible
+        entries.sort()
+        self._walk_cache[repo_path] = (mtime_ns, ignore, entries)
+        return entries
+    
+    def _ignore_spec(self, repo_path: str) -> Any:
+        """
+        Load and cache the repository's root .gitignore.
+        
+        Args:
+            repo_path: Repository path
+            
+        Returns:
+            Compiled pathspec.PathSpec, or None if there is no .gitignore or
+            pathspec is not installed
+        """
+        gitignore_path = os.path.join(repo_path, '.gitignore')
+        try:
+            mtime_ns = os.stat(gitignore_path).st_mtime_ns
+        except OSError:
+            return None
+        
+        cached = self._ignore_cache.get(repo_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
+        try:
+            import pathspec
+        except ImportError:
+            return None
+        
+        with open(gitignore_path, 'r', encoding='utf-8', errors='replace') as f:
+            spec = pathspec.PathSpec.from_lines('gitwildmatch', f)
+        
+        self._ignore_cache[repo_path] = (mtime_ns, spec)
+        return spec
+    
     def find_files(self, pattern: str, path: Optional[str] = None) -> List[str]:
         """
         Find files matching a pattern in the repository.
@@ -136,26 +299,24 @@ class RepoManager:
         if not repo_path:
             raise ValueError("No repository path available")
         
-        matches = []
-        for root, dirs, files in os.walk(repo_path):
-            if '.git' in dirs:
-                dirs.remove('.git')
-            
-            for file in files:
-                if fnmatch.fnmatch(file, pattern):
-                    file_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(file_path, repo_path)
-                    matches.append(rel_path)
+        fn_match = fnmatch.fnmatch
+        basename = os.path.basename
+        matches = [
+            rel_path for rel_path, _, _ in self._walk_files(repo_path)
+            if fn_match(basename(rel_path), pattern)
+        ]
         
         return matches
     
-    def read_file(self, file_path: str, repo_path: Optional[str] = None) -> str:
+    def read_file(self, file_path: str, repo_path: Optional[str] = None,
+                  max_chars: Optional[int] = None) -> str:
         """
         Read a file from the repository.
         
         Args:
             file_path: Relative path to file
             repo_path: Repository path (uses current repo if not provided)
+            max_chars: Read at most this many characters (whole file if not provided)
             
         Returns:
             File content as string
@@ -166,13 +327,15 @@ class RepoManager:
         
         full_path = os.path.join(repo_path, file_path)
         
+        size = max_chars if max_chars else -1
+        
         try:
             with open(full_path, 'r', encoding='utf-8') as f:
-                return f.read()
+                return f.read(size)
         except UnicodeDecodeError:
             # Try with different encoding for binary files
             with open(full_path, 'r', encoding='latin-1') as f:
-                return f.read()
+                return f.read(size)
     
     def write_file(self, file_path: str, content: str, repo_path: Optional[str] = None) -> None:
         """
@@ -192,8 +355,95 @@ class RepoManager:
         # Create directories if they don't exist
         os.makedirs(os.path.dirname(full_path), exist_ok=True)
         
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        if self._raw_write(full_path, content):
+            self._walk_cache.pop(repo_path, None)
+    
+    def write_files(self, files: List[Tuple[str, str]], repo_path: Optional[str] = None) -> None:
+        """
+        Write several files to the repository, creating each directory once
+        and writing the files concurrently.
+        
+        Args:
+            files: List of (relative path, content) pairs
+            repo_path: Repository path (uses current repo if not provided)
+        """
+        repo_path = repo_path or self.repo_path
+        if not repo_path:
+            raise ValueError("No repository path available")
+        
+        # The same file may be listed more than once; as with sequential writes, the last entry wins
+        latest = {
+            os.path.normpath(os.path.join(repo_path, file_path)): content
+            for file_path, content in files
+        }
+        
+        # Create each distinct directory once
+        for directory in {os.path.dirname(full_path) for full_path in latest}:
+            os.makedirs(directory, exist_ok=True)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            written = list(executor.map(self._raw_write, latest.keys(), latest.values()))
+        if any(written):
+            self._walk_cache.pop(repo_path, None)
+    
+    @staticmethod
+    def _raw_write(full_path: str, content: str) -> bool:
+        """
+        Write content to an absolute path whose directory already exists.
+        
+        Files that already hold exactly this content are left untouched so their
+        mtime (and anything keyed on it, like git's index or the walk cache) stays valid.
+        
+        Returns:
+            True if the file was written, False if it was already up to date
+        """
+        data = content.encode('utf-8')
+        try:
+            if os.path.getsize(full_path) == len(data):
+                with open(full_path, 'rb') as f:
+                    if f.read() == data:
+                        return False
+        except OSError:
+            pass
+        
+        with open(full_path, 'wb') as f:
+            f.write(data)
+        return True
+    
+    def apply_diff(self, file_path: str, diff: str, repo_path: Optional[str] = None) -> Optional[str]:
+        """
+        Apply a unified diff to a file without modifying it on disk.
+        
+        Args:
+            file_path: Relative path to file
+            diff: Unified diff against the file's current content
+            repo_path: Repository path (uses current repo if not provided)
+            
+        Returns:
+            Patched file content, or None if the diff does not apply cleanly
+        """
+        repo_path = repo_path or self.repo_path
+        if not repo_path:
+            raise ValueError("No repository path available")
+        
+        full_path = os.path.join(repo_path, file_path)
+        if not diff.endswith("\n"):
+            diff += "\n"
+        
+        # Naming the file explicitly means the diff's header paths don't have to be right.
+        # No fuzz: the model only saw the start of each file, so a hunk whose context
+        # doesn't match exactly is more likely misplaced than slightly stale.
+        try:
+            result = subprocess.run(
+                ["patch", "--quiet", "--forward", "--fuzz=0", "--reject-file=-", "-o", "-", full_path],
+                input=diff, capture_output=True, text=True
+            )
+        except FileNotFoundError:
+            return None
+        
+        if result.returncode != 0:
+            return None
+        return result.stdout
     
     def create_branch(self, branch_name: str, repo_path: Optional[str] = None) -> None:
         """
@@ -207,30 +457,38 @@ class RepoManager:
         if not repo_path:
             raise ValueError("No repository path available")
         
-        os.chdir(repo_path)
-        
         # Create and checkout new branch
-        subprocess.run(["git", "checkout", "-b", branch_name], check=True)
+        subprocess.run(["git", "checkout", "-b", branch_name], cwd=repo_path, check=True)
     
-    def commit_changes(self, message: str, repo_path: Optional[str] = None) -> None:
+    def commit_changes(self, message: str, repo_path: Optional[str] = None) -> bool:
         """
         Commit all changes in the repository.
         
         Args:
             message: Commit message
             repo_path: Repository path (uses current repo if not provided)
+            
+        Returns:
+            True if a commit was created, False if there was nothing to commit
+            or git failed (a warning is printed)
         """
         repo_path = repo_path or self.repo_path
         if not repo_path:
             raise ValueError("No repository path available")
         
-        os.chdir(repo_path)
-        
-        # Add all changes
-        subprocess.run(["git", "add", "."], check=True)
-        
-        # Commit changes
-        subprocess.run(["git", "commit", "-m", message], check=True)
+        # Nothing to do if the generated files match what is already there
+        status = subprocess.run(["git", "status", "--porcelain"],
+                                cwd=repo_path, capture_output=True, text=True)
+        if status.returncode == 0 and not status.stdout.strip():
+            return False
+        
+        # Add all changes and commit them
+        for cmd in (["git", "add", "-A"], ["git", "commit", "-m", message]):
+            result = subprocess.run(cmd, cwd=repo_path, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"Warning: '{' '.join(cmd[:2])}' failed: {result.stderr.strip()}")
+                return False
+        return True
     
     def push_changes(self, branch: Optional[str] = None, repo_path: Optional[str] = None) -> None:
         """
@@ -244,12 +502,20 @@ class RepoManager:
         if not repo_path:
             raise ValueError("No repository path available")
         
-        os.chdir(repo_path)
-        
         if branch:
-            subprocess.run(["git", "push", "-u", "origin", branch], check=True)
+            subprocess.run(["git", "push", "-u", "origin", branch], cwd=repo_path, check=True)
         else:
-            subprocess.run(["git", "push"], check=True)
+            subprocess.run(["git", "push"], cwd=repo_path, check=True)
+    
+    @staticmethod
+    def _compile_patterns(patterns: List[str]) -> "re.Pattern[str]":
+        """
+        Combine glob patterns into one regex with a named group (p0, p1, ...)
+        per pattern, so match.lastgroup identifies which pattern matched.
+        """
+        return re.compile('|'.join(
+            f'(?P<p{i}>{fnmatch.translate(pattern)})' for i, pattern in enumerate(patterns)
+        ))
     
     def get_repository_context(self, max_files: int = 20) -> str:
         """
@@ -265,17 +531,63 @@ class RepoManager:
             raise ValueError("No repository loaded")
         
         analysis = self.analyze_repository()
+        return "\n\n".join([
+            self.get_static_context(max_files, analysis),
+            self.get_dynamic_context(analysis)
+        ])
+    
+    def get_dynamic_context(self, analysis: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get the parts of the repository context that change between runs
+        (e.g. the checked-out branch). Place these after the static context
+        so the static prefix can be reused by prompt caching.
+        
+        Args:
+            analysis: Result of analyze_repository (computed if not provided)
+            
+        Returns:
+            Dynamic context as formatted string
+        """
+        if not self.repo_path:
+            raise ValueError("No repository loaded")
+        
+        analysis = analysis or self.analyze_repository()
+        if not analysis['git_info']:
+            return ""
+        
+        return "\n".join([
+            "=== CURRENT STATE ===",
+            f"Current branch: {analysis['git_info'].get('current_branch', 'unknown')}"
+        ])
+    
+    def get_static_context(self, max_files: int = 20, analysis: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get the deterministic part of the repository context: overview and
+        key file contents, in a stable order.
+        
+        Args:
+            max_files: Maximum number of files to include in context
+            analysis: Result of analyze_repository (computed if not provided)
+            
+        Returns:
+            Static context as formatted string
+        """
+        if not self.repo_path:
+            raise ValueError("No repository loaded")
+        
+        analysis = analysis or self.analyze_repository()
         context = []
         
         # Add repository overview
         context.append("=== REPOSITORY ANALYSIS ===")
-        context.append(f"Path: {analysis['path']}")
+        # The remote URL rather than the local clone path, which is a fresh
+        # temp directory each run and would make every prompt unique
+        context.append(f"Repository: {self.current_repo or analysis['path']}")
         context.append(f"Total files: {len(analysis['files'])}")
         context.append(f"Size: {analysis['size']} bytes")
-        context.append(f"Languages: {', '.join(analysis['languages'].keys())}")
+        context.append(f"Languages: {', '.join(sorted(analysis['languages']))}")
         
         if analysis['git_info']:
-            context.append(f"Current branch: {analysis['git_info'].get('current_branch', 'unknown')}")
             context.append(f"Remote: {analysis['git_info'].get('remote_url', 'unknown')}")
         
         context.append("\n=== FILE STRUCTURE ===")
@@ -287,29 +599,79 @@ class RepoManager:
             "*.py", "*.js", "*.ts", "*.go", "*.rs", "*.java"
         ]
         
-        included_files = set()
-        files_added = 0
-        
-        # First, add important files
-        for pattern in important_patterns:
-            if files_added >= max_files:
-                break
-            
-            matches = self.find_files(pattern)
-            for file_path in matches[:5]:  # Limit per pattern
-                if file_path not in included_files and files_added < max_files:
-                    try:
-                        content = self.read_file(file_path)
-                        context.append(f"\n--- {file_path} ---")
-                        context.append(content[:2000])  # Limit content length
-                        included_files.add(file_path)
-                        files_added += 1
-                    except Exception:
-                        continue
+        # Classify every file into the first pattern it matches in a single pass
+        pattern_re = self._compile_patterns(important_patterns)
+        buckets: List[List[str]] = [[] for _ in important_patterns]
+        for rel_path, size, _ in self._walk_files(self.repo_path):
+            if size > MAX_CONTEXT_FILE_SIZE:
+                continue  # Likely generated, minified or vendored
+            match = pattern_re.match(os.path.basename(rel_path))
+            if match:
+                buckets[int(match.lastgroup[1:])].append(rel_path)
+        
+        # First, pick important files (limited per pattern; the walk is already sorted)
+        selected = []
+        for matches in buckets:
+            selected.extend(matches[:5])
+        selected = selected[:max_files]
+        
+        # Read them concurrently; file reads release the GIL
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(self._safe_read_truncated, selected))
+        
+        for result in results:
+            if result is not None:
+                file_path, content = result
+                context.append(f"\n--- {file_path} ---")
+                context.append(content)
         
         return "\n".join(context)
     
+    def _safe_read_truncated(self, file_path: str) -> Optional[Tuple[str, str]]:
+        """
+        Read the start of a file for the LLM context.
+        
+        Args:
+            file_path: Relative path to file
+            
+        Returns:
+            (file_path, first 2000 characters) or None if the file can't be read
+        """
+        try:
+            return file_path, self.read_file(file_path, max_chars=2000)  # Limit content length
+        except Exception:
+            return None
+    
     def cleanup(self) -> None:
-        """Clean up temporary directories."""
-        if self.work_dir and os.path.exists(self.work_dir):
-            shutil.rmtree(self.work_dir)
\ No newline at end of file
+        """
+        Clean up temporary directories.
+        
+        Clones in directories RepoManager created are released to the cache for
+        reuse, and the working directory is kept while it holds any of them;
+        purge_cache() (run automatically at exit) removes those.
+        """
+        for repo_url, clone_path in self._clones.items():
+            if os.path.dirname(clone_path) in RepoManager._temp_dirs:
+                RepoManager._repo_cache[repo_url] = clone_path
+        self._clones.clear()
+        
+        if not self.work_dir or not os.path.exists(self.work_dir):
+            return
+        if any(os.path.dirname(path) == self.work_dir for path in RepoManager._repo_cache.values()):
+            return
+        shutil.rmtree(self.work_dir)
+    
+    @classmethod
+    def purge_cache(cls) -> None:
+        """Remove all released clones (and their temporary directories once empty)."""
+        for path in cls._repo_cache.values():
+            shutil.rmtree(path, ignore_errors=True)
+            try:
+                os.rmdir(os.path.dirname(path))
+            except OSError:
+                pass  # Still holds other clones
+        cls._repo_cache.clear()
+
+
+# The clone cache only lives as long as the process, so remove released clones on exit
+atexit.register(RepoManager.purge_cache)
\ No newline at end of file